@@ -0,0 +1,49 @@
+import functools
+import librosa
+import os
+import numpy as np
+import soundfile as sf
+
+# Formats libsndfile decodes in-process, without going through ffmpeg
+SUPPORTED_EXTENSIONS = (".wav", ".flac", ".ogg")
+FILE_DIALOG_FILTER = "Audio Files (*.wav *.flac *.ogg);;All Files (*)"
+
+BLOCK_SIZE = 65536  # Frames read from the file per block
+
+
+def load_audio(path):
+    # Native rate decode shared by the GUI widgets, cached until the window showing the file closes.
+    # The modification time is part of the key so a file changed on disk is decoded again.
+    return cached_audio(path, os.stat(path).st_mtime_ns)
+
+
+def clear_cache():
+    cached_audio.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def cached_audio(path, mtime):
+    return decode_audio(path)
+
+
+def decode_audio(path, sr=None):
+    # Decode the file to mono float32 block by block, then resample the whole signal once.
+    # Not cached, the caller owns the returned array.
+    with sf.SoundFile(path) as audio_file:
+        native_rate = audio_file.samplerate
+        signal = np.empty(audio_file.frames, dtype=np.float32)
+
+        position = 0
+        for block in audio_file.blocks(blocksize=BLOCK_SIZE, dtype='float32', always_2d=True):
+            # Downmix to mono the same way librosa.load does
+            block = block.mean(axis=1)
+            signal[position:position + len(block)] = block
+            position += len(block)
+
+    signal = signal[:position]
+
+    if sr is not None and sr != native_rate:
+        signal = librosa.resample(signal, orig_sr=native_rate, target_sr=sr)
+        return signal, sr
+
+    return signal, native_rate
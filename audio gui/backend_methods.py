@@ -1,57 +1,163 @@
-import keras
-import librosa
 import numpy as np
-from pydub import AudioSegment
-from pydub.utils import make_chunks
-import time as t
 import os
 
+import audio_decoding
+import feature_extraction
+import segment_export
+
 def build_timestamp(start_timestamp):
     length_of_timestamp = 5
-    hours, minutes, seconds, milliseconds = int(start_timestamp[0:2]), int(start_timestamp[3:5]), int(start_timestamp[6:8]), int(start_timestamp[9:])
-    total_seconds = hours * 3600 + minutes * 60 + seconds + milliseconds / 1000.0 + length_of_timestamp
-    time = t.gmtime(total_seconds)
-    final_timestamp = t.strftime('%H:%M:%S.000', time)
+    hours, minutes, seconds = start_timestamp.split(":")
+    total_seconds = int(int(hours) * 3600 + int(minutes) * 60 + float(seconds) + length_of_timestamp)
+
+    # Hours are not wrapped at 24, so files longer than a day keep increasing timestamps
+    final_timestamp = f"{total_seconds // 3600:02d}:{total_seconds // 60 % 60:02d}:{total_seconds % 60:02d}.000"
     return final_timestamp
 
 
-def runBackendProcessing(path):
-    model = keras.models.load_model("audio gui/classification_model.keras")
+DEFAULT_MODEL_PATH = "audio gui/classification_model.keras"
+CHUNK_LENGTH_MS = feature_extraction.CHUNK_LENGTH_MS
+MODEL_SAMPLE_RATE = feature_extraction.MODEL_SAMPLE_RATE
+PREDICT_BATCH_SIZE = 64
+
+class_dict = {0: 'dog', 1: 'chainsaw', 2: 'crackling_fire', 3: 'helicopter', 4: 'rain', 5: 'crying_baby',
+              6: 'clock_tick', 7: 'sneezing', 8: 'rooster', 9: 'sea_waves'}
+
+
+def runBackendProcessing(path, model_path=DEFAULT_MODEL_PATH):
+    label_tracks, _ = runComparisonProcessing(path, [model_path])
+    return next(iter(label_tracks.values()))
+
+
+def runComparisonProcessing(path, model_paths, workers=None):
+    # Features are extracted once and shared by every model
+    models = load_models(model_paths)
+    features, chunk_indices, num_chunks = extract_features(path, workers)
+
+    label_tracks = {}
+    for name, model in models.items():
+        if len(features) > 0:
+            probabilities = model.predict(features, batch_size=PREDICT_BATCH_SIZE)
+        else:
+            probabilities = np.zeros((0, len(class_dict)))
+        label_tracks[name] = build_processed_data(probabilities, chunk_indices, num_chunks)
+
+    return label_tracks, build_disagreement_report(label_tracks)
+
 
-    # cut file into pieces
-    full_audio_file = AudioSegment.from_file(path, "wav")
-    chunk_length_ms = 5000
-    chunks = make_chunks(full_audio_file, chunk_length_ms)
+def exportBackendProcessing(path, output_path, model_paths=None, workers=None):
+    # Stream each model's segments to its own table batch by batch instead of building processed_data
+    if model_paths is None:
+        model_paths = [DEFAULT_MODEL_PATH]
 
-    # Export all the individual chunks, load, classify, put into array as [timestamp_s, timestamp_e, label]
-    processed_data = [[0] * 3 for i in range(len(chunks))]
+    models = load_models(model_paths)
+    features, _, _ = extract_features(path, workers)
+
+    counts = {}
+    for (name, model), model_output_path in zip(models.items(), build_export_paths(output_path, list(models))):
+        segments = iter_predicted_segments(predict_in_batches(model, features))
+        counts[name] = segment_export.export_segments(segments, model_output_path)
+
+    return counts
+
+
+def build_export_paths(output_path, names):
+    # A single model writes to output_path, several models get their name before the extension
+    if len(names) == 1:
+        return [output_path]
+
+    root, extension = os.path.splitext(output_path)
+    return [f"{root}_{name}{extension}" for name in names]
+
+
+def predict_in_batches(model, features):
+    for batch_start in range(0, len(features), PREDICT_BATCH_SIZE):
+        yield model.predict(features[batch_start:batch_start + PREDICT_BATCH_SIZE], verbose=0)
+
+
+def iter_predicted_segments(probability_batches):
+    # Yield [timestamp_s, timestamp_e, label, probability] for every classified chunk in order
     start_timestamp = "00:00:00.000"
-    for i, chunk in enumerate(chunks):
-        chunk_name = "chunk{0}.wav".format(i)
-        chunk.export(chunk_name, format="wav")
-        signal, rate = librosa.load(chunk_name, duration=5)
-
-        if len(signal) > rate * 2:
-            processed_data[i][0] = start_timestamp
-            
-            for m in range(3):
-                n = np.random.randint(0, len(signal) - (rate * 2))
-                sig_ = signal[n: int(n + (rate * 2))]
-                mfcc = librosa.feature.mfcc(y=sig_, sr=rate, n_mfcc=13)
-                mfcc = np.array(mfcc)
-                X_new = mfcc.reshape(1, 13, 87, 1)
-            prediction = np.argmax(model.predict(X_new), axis=-1)
-            class_dict = {0: 'dog', 1: 'chainsaw', 2: 'crackling_fire', 3: 'helicopter', 4: 'rain', 5: 'crying_baby',
-                            6: 'clock_tick', 7: 'sneezing', 8: 'rooster', 9: 'sea_waves'}
-            processed_data[i][2] = (class_dict[prediction[0]])
+    for probabilities in probability_batches:
+        for probability in probabilities:
+            prediction = int(np.argmax(probability))
             end_timestamp = build_timestamp(start_timestamp)
-            processed_data[i][1] = end_timestamp
+            yield [start_timestamp, end_timestamp, class_dict[prediction], float(probability[prediction])]
             start_timestamp = end_timestamp
-    
-    delete_files_starting_with("chunk")
-    
+
+
+def build_model_names(model_paths):
+    # Name each model after its file, every name shared by several files gets a " (n)" suffix
+    names = [os.path.splitext(os.path.basename(model_path))[0] for model_path in model_paths]
+
+    seen = {}
+    unique_names = []
+    for name in names:
+        if names.count(name) > 1:
+            seen[name] = seen.get(name, 0) + 1
+            name = f"{name} ({seen[name]})"
+        unique_names.append(name)
+
+    return unique_names
+
+
+def load_models(model_paths):
+    # keras is imported here rather than at the top of the module: spawned feature workers
+    # re-run the entry script's imports, which reach this module through main.py.
+    import keras
+
+    models = {}
+    for name, model_path in zip(build_model_names(model_paths), model_paths):
+        models[name] = keras.models.load_model(model_path)
+    return models
+
+
+def extract_features(path, workers=None):
+    # Decode and resample the whole file once, then cut it into pieces.
+    # The decode is not cached, it is released once the features are extracted.
+    signal, rate = audio_decoding.decode_audio(path, MODEL_SAMPLE_RATE)
+    chunk_length = int(rate * CHUNK_LENGTH_MS / 1000)
+    num_chunks = int(np.ceil(len(signal) / chunk_length))
+
+    # Pick a random 2 second crop of every chunk up front so serial and parallel runs match
+    chunk_indices = []
+    crop_starts = []
+    for i in range(num_chunks):
+        chunk = signal[i * chunk_length:(i + 1) * chunk_length]
+
+        if len(chunk) > rate * feature_extraction.CROP_LENGTH_S:
+            n = np.random.randint(0, len(chunk) - (rate * feature_extraction.CROP_LENGTH_S))
+            chunk_indices.append(i)
+            crop_starts.append(i * chunk_length + n)
+
+    features = feature_extraction.compute_features(signal, rate, crop_starts, workers)
+
+    return features, chunk_indices, num_chunks
+
+
+def build_processed_data(probabilities, chunk_indices, num_chunks):
+    # Put the predictions into an array as [timestamp_s, timestamp_e, label, probability]
+    processed_data = [[0] * 4 for i in range(num_chunks)]
+    for i, segment in zip(chunk_indices, iter_predicted_segments([probabilities])):
+        processed_data[i] = segment
+
     return processed_data
 
+
+def build_disagreement_report(label_tracks):
+    # List the chunks where the models do not agree as [timestamp_s, timestamp_e, {model: label}]
+    names = list(label_tracks)
+    report = []
+    for rows in zip(*label_tracks.values()):
+        if rows[0][0] == 0:
+            continue
+
+        labels = {name: row[2] for name, row in zip(names, rows)}
+        if len(set(labels.values())) > 1:
+            report.append([rows[0][0], rows[0][1], labels])
+
+    return report
+
 def delete_files_starting_with(prefix):
     current_directory = os.getcwd()
     for filename in os.listdir(current_directory):
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import time as t
+
+import librosa
+from pydub import AudioSegment
+from pydub.utils import make_chunks
+
+import audio_decoding
+import feature_extraction
+
+
+def decode_with_pydub(path):
+    # Previous path: pydub decode, export every chunk and reload it with librosa
+    full_audio_file = AudioSegment.from_file(path, "wav")
+    chunks = make_chunks(full_audio_file, feature_extraction.CHUNK_LENGTH_MS)
+
+    signals = []
+    with tempfile.TemporaryDirectory() as chunk_directory:
+        for i, chunk in enumerate(chunks):
+            chunk_name = os.path.join(chunk_directory, "chunk{0}.wav".format(i))
+            chunk.export(chunk_name, format="wav")
+            signal, rate = librosa.load(chunk_name, duration=5)
+            signals.append(signal)
+
+    return signals
+
+
+def decode_with_soundfile(path):
+    # Current path: one block-wise libsndfile decode and one resample to the model rate
+    signal, rate = audio_decoding.decode_audio(path, sr=feature_extraction.MODEL_SAMPLE_RATE)
+    chunk_length = int(rate * feature_extraction.CHUNK_LENGTH_MS / 1000)
+    return [signal[i:i + chunk_length] for i in range(0, len(signal), chunk_length)]
+
+
+def time_decoder(decoder, path, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = t.perf_counter()
+        decoder(path)
+        best = min(best, t.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark_decoding.py <file.wav> [repeats]")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    pydub_time = time_decoder(decode_with_pydub, path, repeats)
+    soundfile_time = time_decoder(decode_with_soundfile, path, repeats)
+
+    print(f"pydub + per-chunk librosa.load: {pydub_time:.3f} s")
+    print(f"soundfile + single resample:    {soundfile_time:.3f} s")
+    print(f"Speedup: {pydub_time / soundfile_time:.1f}x")
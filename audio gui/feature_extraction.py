@@ -0,0 +1,74 @@
+import multiprocessing
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import spectral_analysis
+
+# Spawned workers import this module and re-run the entry script's top-level imports (main.py
+# reaches backend_methods), so neither may import keras at module level
+
+CHUNK_LENGTH_MS = 5000
+MODEL_SAMPLE_RATE = 22050
+CROP_LENGTH_S = 2
+MIN_CHUNKS_PER_SHARD = 512  # ~40 min of audio per worker, smaller files are not worth starting a process pool for
+
+
+def compute_features(signal, rate, crop_starts, workers=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(crop_starts) // MIN_CHUNKS_PER_SHARD)
+
+    if workers > 1:
+        return extract_features_parallel(signal, rate, crop_starts, workers)
+    return compute_mfccs(signal, rate, crop_starts)
+
+
+def compute_mfccs(signal, rate, crop_starts):
+    # Every crop gets its own STFT, exactly like librosa.feature.mfcc on the crop would
+    crop_length = int(rate * CROP_LENGTH_S)
+    n_frames = 1 + crop_length // spectral_analysis.HOP_LENGTH
+    features = np.empty((len(crop_starts), spectral_analysis.N_MFCC, n_frames, 1), dtype=np.float32)
+    for i, n in enumerate(crop_starts):
+        mfcc = spectral_analysis.mfcc(signal[n:n + crop_length], rate)
+        features[i] = mfcc.reshape(spectral_analysis.N_MFCC, n_frames, 1)
+    return features
+
+
+def extract_features_parallel(signal, rate, crop_starts, workers):
+    # Share the decoded signal with the workers instead of pickling it for every shard.
+    # Each crop is transformed on its own, so shards need no overlap at their edges.
+    shm = shared_memory.SharedMemory(create=True, size=signal.nbytes)
+    shared_signal = np.ndarray(signal.shape, dtype=signal.dtype, buffer=shm.buf)
+    try:
+        shared_signal[:] = signal
+
+        shards = np.array_split(np.array(crop_starts), workers)
+        tasks = [(shm.name, signal.shape, signal.dtype.str, rate, shard) for shard in shards]
+
+        # Spawn fresh workers rather than forking a process that runs TensorFlow and Qt threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            features = list(executor.map(extract_shard_features, tasks))
+    finally:
+        # The view has to be released before the segment can be closed
+        del shared_signal
+        try:
+            shm.close()
+        finally:
+            shm.unlink()
+
+    return np.concatenate(features)
+
+
+def extract_shard_features(task):
+    # Runs in a worker process on one contiguous shard of the crops
+    shm_name, shape, dtype, rate, crop_starts = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    signal = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        return compute_mfccs(signal, rate, crop_starts)
+    finally:
+        del signal
+        shm.close()
@@ -10,14 +10,16 @@ from spectrogram_widget import SpectrogramWidget
 
 import sounddevice as sd
 import threading
-import librosa
+import audio_decoding
+import segment_export
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, model_paths=None):
         super().__init__()
         
         # Fields
         self.file_name = "" #file_name field
+        self.model_paths = model_paths # models to compare, None runs the default model only
         self.audio_window = None
         self.initUI()
 
@@ -45,6 +47,12 @@ class MainWindow(QMainWindow):
         self.confirm_button.clicked.connect(self.onConfirmClicked)
         self.confirm_button.hide()
 
+        # Create a button to open the file with previously exported labels (initially hidden)
+        self.import_labels_button = QPushButton("Import Labels", self)
+        self.import_labels_button.setFixedSize(200, 50)
+        self.import_labels_button.clicked.connect(self.onImportLabelsClicked)
+        self.import_labels_button.hide()
+
         # Layouts to arrange the elements
         main_layout = QVBoxLayout()
         folder_layout = QHBoxLayout()
@@ -57,6 +65,7 @@ class MainWindow(QMainWindow):
         confirm_layout.addLayout(folder_layout)
         confirm_layout.addItem(QSpacerItem(20, 20, vPolicy=QSizePolicy.Fixed))  # Adding vertical spacer
         confirm_layout.addWidget(self.confirm_button)
+        confirm_layout.addWidget(self.import_labels_button)
         confirm_layout.setAlignment(Qt.AlignHCenter)  # Center confirm_button horizontally
 
         main_layout.addLayout(confirm_layout)  # Add confirm_layout to the main_layout
@@ -69,7 +78,7 @@ class MainWindow(QMainWindow):
     def openFileDialog(self, event):
         options = QFileDialog.Options()
         options |= QFileDialog.ReadOnly  # Set the file dialog to read-only mode
-        file_name, _ = QFileDialog.getOpenFileName(self, "Choose an audio file", "", "Audio Files (*.wav);;All Files (*)", options=options)
+        file_name, _ = QFileDialog.getOpenFileName(self, "Choose an audio file", "", audio_decoding.FILE_DIALOG_FILTER, options=options)
 
         if file_name:
             # Update the audio_file_label text with the selected file name
@@ -78,8 +87,9 @@ class MainWindow(QMainWindow):
             # Stores the file_name in a field
             self.file_name = file_name
 
-            # Show the confirm button when an audio file is selected
+            # Show the confirm and import buttons when an audio file is selected
             self.confirm_button.show()
+            self.import_labels_button.show()
     
     def onConfirmClicked(self):
         if self.file_name:
@@ -88,10 +98,24 @@ class MainWindow(QMainWindow):
             self.audio_window.showMaximized()
 
             # Run backend
-            self.audio_window.waveform_widget.runBackendProcessing()
+            self.audio_window.waveform_widget.runBackendProcessing(self.model_paths)
+            self.audio_window.populateLabelTrackDropdown()
 
             # Close the current window
             self.close()
+
+    def onImportLabelsClicked(self):
+        if self.file_name:
+            labels_file_name, _ = QFileDialog.getOpenFileName(self, "Choose a labels file", "", segment_export.SEGMENT_FILE_FILTER)
+
+            if labels_file_name:
+                # Open the audio window with the saved labels instead of running the backend
+                self.audio_window = AudioWindow(self.file_name)
+                self.audio_window.showMaximized()
+                self.audio_window.importLabels(labels_file_name)
+
+                # Close the current window
+                self.close()
             
 class AudioWindow(QMainWindow):
     def __init__(self, file_name):
@@ -146,6 +170,21 @@ class AudioWindow(QMainWindow):
         self.adjust_labels_dropdown = QComboBox(self)
         self.adjust_labels_dropdown.hide()
 
+        # Create the label track dropdown (only shown when comparing several models)
+        self.label_track_dropdown = QComboBox(self)
+        self.label_track_dropdown.currentIndexChanged.connect(self.onLabelTrackChanged)
+        self.label_track_dropdown.hide()
+
+        # Create the label showing how many segments the compared models disagree on (initially hidden)
+        self.disagreement_label = QLabel("", self)
+        self.disagreement_label.hide()
+
+        # Create the export and import buttons for the label tables
+        self.export_labels_button = QPushButton("Export Labels", self)
+        self.export_labels_button.clicked.connect(self.exportLabelsDialog)
+        self.import_labels_button = QPushButton("Import Labels", self)
+        self.import_labels_button.clicked.connect(self.importLabelsDialog)
+
         # Create layout for checkboxes and labels
         checkbox_layout = QHBoxLayout()
         checkbox_layout.addWidget(self.adjust_labels_checkbox)
@@ -156,6 +195,10 @@ class AudioWindow(QMainWindow):
         control_layout.addWidget(self.audio_control_button, alignment=Qt.AlignCenter)
         control_layout.addLayout(checkbox_layout)
         control_layout.addWidget(self.adjust_labels_dropdown)
+        control_layout.addWidget(self.label_track_dropdown)
+        control_layout.addWidget(self.disagreement_label)
+        control_layout.addWidget(self.export_labels_button)
+        control_layout.addWidget(self.import_labels_button)
 
         layout = QGridLayout()
         layout.addWidget(self.waveform_widget, 0, 0, 1, 1, alignment=Qt.AlignTop)
@@ -166,13 +209,17 @@ class AudioWindow(QMainWindow):
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
+        # Show the render times of both canvases in the status bar
+        self.waveform_widget.canvas.frame_rendered.connect(self.showFrameTimes)
+        self.spectrogram_widget.canvas.frame_rendered.connect(self.showFrameTimes)
+
         # Load audio data
         self.loadAudioData()
 
     def loadAudioData(self):
         try:
-            # Load the audio data using librosa
-            self.audio_data, self.sample_rate = librosa.load(self.file_name, sr=None, mono=True, dtype=float)
+            # Load the audio data, sharing the decode with the other widgets
+            self.audio_data, self.sample_rate = audio_decoding.load_audio(self.file_name)
             self.waveform_widget.loadAudioData()
             self.spectrogram_widget.loadAudioData()
         except Exception as e:
@@ -296,6 +343,77 @@ class AudioWindow(QMainWindow):
         self.populateAdjustLabelsDropdown()
         self.waveform_widget.changeText()
 
+    def populateLabelTrackDropdown(self):
+        label_tracks = self.waveform_widget.getLabelTracks()
+
+        self.label_track_dropdown.clear()
+        self.label_track_dropdown.addItems(label_tracks)
+
+        if len(label_tracks) > 1:
+            disagreements = self.waveform_widget.getDisagreements()
+            self.disagreement_label.setText(f"Models disagree on {len(disagreements)} segments (shaded)")
+            self.label_track_dropdown.show()
+            self.disagreement_label.show()
+        else:
+            self.label_track_dropdown.hide()
+            self.disagreement_label.hide()
+
+    def onLabelTrackChanged(self, index):
+        if index >= 0:
+            self.waveform_widget.setActiveTrack(self.label_track_dropdown.currentText())
+
+            # Refresh the labels offered for renaming without opening the rename popup
+            if self.adjust_labels_checkbox.isChecked():
+                self.open_popup = False
+                self.populateAdjustLabelsDropdown()
+
+    def exportLabelsDialog(self):
+        if self.waveform_widget.getProcessedData():
+            file_name, _ = QFileDialog.getSaveFileName(self, "Export labels", "", segment_export.SEGMENT_FILE_FILTER)
+
+            if file_name:
+                try:
+                    count = self.waveform_widget.exportProcessedData(file_name)
+                    print(f"Exported {count} labels to {file_name}")
+                except Exception as e:
+                    print(f"Error exporting labels: {str(e)}")
+
+    def importLabelsDialog(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Import labels", "", segment_export.SEGMENT_FILE_FILTER)
+
+        if file_name:
+            self.importLabels(file_name)
+
+    def importLabels(self, file_name):
+        try:
+            self.waveform_widget.importProcessedData(file_name)
+        except Exception as e:
+            print(f"Error importing labels: {str(e)}")
+            return
+
+        self.populateLabelTrackDropdown()
+
+        # Refresh the labels offered for renaming without opening the rename popup
+        if self.adjust_labels_checkbox.isChecked():
+            self.open_popup = False
+            self.populateAdjustLabelsDropdown()
+
+    def closeEvent(self, event):
+        # Free the decoded audio held for this file
+        self.stopAudio()
+        audio_decoding.clear_cache()
+        super().closeEvent(event)
+
+    def showFrameTimes(self):
+        messages = []
+        for name, widget in (("Waveform", self.waveform_widget), ("Spectrogram", self.spectrogram_widget)):
+            frame_time = widget.render_scheduler.frameTime()
+            if frame_time is not None:
+                average_frame_time = widget.render_scheduler.averageFrameTime()
+                messages.append(f"{name}: {frame_time * 1000:.1f} ms (avg {average_frame_time * 1000:.1f} ms)")
+
+        self.statusBar().showMessage("   ".join(messages))
+
     def zoomInWaveform(self):
         self.waveform_widget.zoomInClicked()
 
@@ -306,6 +424,6 @@ class AudioWindow(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    mainWindow = MainWindow()
+    mainWindow = MainWindow(sys.argv[1:] or None) # e.g. python main.py model_a.keras model_b.keras
     mainWindow.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,74 @@
+from collections import deque
+import time as t
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+FRAME_INTERVAL_MS = 16  # Redraw at most once per frame (~60 fps)
+FRAME_HISTORY = 60  # Number of frame times kept for the average
+
+
+class LayoutCanvas(FigureCanvas):
+    # Canvas that applies a pending layout right before it renders and times every draw,
+    # including the ones Qt triggers itself on resize and expose
+    frame_rendered = pyqtSignal(float)
+
+    def __init__(self, figure):
+        self.layout_dirty = True
+        self.frame_times = deque(maxlen=FRAME_HISTORY)
+        super().__init__(figure)
+
+    def resizeEvent(self, event):
+        # The Qt canvas schedules its own draw_idle on resize, only mark the layout stale here
+        self.layout_dirty = True
+        super().resizeEvent(event)
+
+    def draw(self):
+        start = t.perf_counter()
+
+        if self.layout_dirty:
+            self.figure.tight_layout()
+            self.layout_dirty = False
+
+        super().draw()
+
+        frame_time = t.perf_counter() - start
+        self.frame_times.append(frame_time)
+        self.frame_rendered.emit(frame_time)
+
+
+class RenderScheduler(QObject):
+    def __init__(self, canvas, parent=None):
+        super().__init__(parent)
+
+        self.canvas = canvas
+        self.pending = False
+        self.last_draw_time = 0.0
+
+        # Single shot timer that coalesces every request made within a frame
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def requestDraw(self):
+        if not self.pending:
+            self.pending = True
+            elapsed_ms = (t.perf_counter() - self.last_draw_time) * 1000
+            self.timer.start(max(0, int(FRAME_INTERVAL_MS - elapsed_ms)))
+
+    def requestLayout(self):
+        # Recompute the layout on the next draw (axes were added or their ticks changed)
+        self.canvas.layout_dirty = True
+        self.requestDraw()
+
+    def flush(self):
+        self.pending = False
+        self.last_draw_time = t.perf_counter()
+        self.canvas.draw_idle()
+
+    def frameTime(self):
+        # Seconds the last draw of the canvas took, layout included
+        return self.canvas.frame_times[-1] if self.canvas.frame_times else None
+
+    def averageFrameTime(self):
+        frame_times = self.canvas.frame_times
+        return sum(frame_times) / len(frame_times) if frame_times else None
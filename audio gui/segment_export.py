@@ -0,0 +1,179 @@
+import csv
+import json
+import os
+
+# Columns of an exported segment table, matching the rows of processed_data
+SEGMENT_COLUMNS = ["start", "end", "label", "probability"]
+SEGMENT_FILE_FILTER = "CSV (*.csv);;JSON Lines (*.jsonl);;Audacity Labels (*.txt);;Parquet (*.parquet)"
+
+PARQUET_ROW_GROUP_SIZE = 4096  # Segments buffered before a Parquet row group is written
+
+
+def timestamp_to_seconds(timestamp):
+    # Convert HR:MM:SS.SSS timestamp to seconds, hours may be 24 or more
+    hours, minutes, seconds = timestamp.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def seconds_to_timestamp(seconds):
+    # Convert seconds to the timestamp format "HR:MM:SS.SSS" without wrapping hours at 24
+    hours, milliseconds = divmod(int(round(seconds * 1000)), 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def normalize_segment(segment):
+    # processed_data rows are [start, end, label] or [start, end, label, probability]
+    probability = segment[3] if len(segment) > 3 else None
+    return [segment[0], segment[1], segment[2], None if probability is None else float(probability)]
+
+
+class SegmentWriter:
+    # Base class for the streaming writers, usable as a context manager
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CsvSegmentWriter(SegmentWriter):
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(SEGMENT_COLUMNS)
+
+    def write(self, segment):
+        start, end, label, probability = normalize_segment(segment)
+        self.writer.writerow([start, end, label, "" if probability is None else probability])
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlSegmentWriter(SegmentWriter):
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def write(self, segment):
+        self.file.write(json.dumps(dict(zip(SEGMENT_COLUMNS, normalize_segment(segment)))) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class AudacitySegmentWriter(SegmentWriter):
+    # Audacity label track: start and end in seconds, tab separated, no probability
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def write(self, segment):
+        start, end, label, _ = normalize_segment(segment)
+        self.file.write(f"{timestamp_to_seconds(start):.6f}\t{timestamp_to_seconds(end):.6f}\t{label}\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSegmentWriter(SegmentWriter):
+    # Buffers at most one row group of segments before writing it out
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([("start", pa.string()), ("end", pa.string()),
+                                 ("label", pa.string()), ("probability", pa.float64())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.columns = [[] for _ in SEGMENT_COLUMNS]
+
+    def write(self, segment):
+        for column, value in zip(self.columns, normalize_segment(segment)):
+            column.append(value)
+
+        if len(self.columns[0]) >= PARQUET_ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.columns[0]:
+            self.writer.write_table(self.pa.Table.from_arrays(self.columns, schema=self.schema))
+            self.columns = [[] for _ in SEGMENT_COLUMNS]
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def read_csv_segments(path):
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            probability = row.get("probability")
+            yield [row["start"], row["end"], row["label"], float(probability) if probability else None]
+
+
+def read_jsonl_segments(path):
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                yield [row["start"], row["end"], row["label"], row.get("probability")]
+
+
+def read_audacity_segments(path):
+    with open(path) as file:
+        for line in file:
+            parts = line.rstrip("\n").split("\t")
+
+            # Skip the frequency lines Audacity writes for spectral selections
+            if len(parts) < 3 or parts[0] == "\\":
+                continue
+
+            yield [seconds_to_timestamp(float(parts[0])), seconds_to_timestamp(float(parts[1])), parts[2], None]
+
+
+def read_parquet_segments(path):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(columns=SEGMENT_COLUMNS):
+        yield from (list(row) for row in zip(*(column.to_pylist() for column in batch.columns)))
+
+
+SEGMENT_FORMATS = {
+    ".csv": (CsvSegmentWriter, read_csv_segments),
+    ".jsonl": (JsonlSegmentWriter, read_jsonl_segments),
+    ".txt": (AudacitySegmentWriter, read_audacity_segments),
+    ".parquet": (ParquetSegmentWriter, read_parquet_segments),
+}
+
+
+def get_segment_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SEGMENT_FORMATS:
+        raise ValueError(f"Unsupported segment file format: {extension}")
+    return SEGMENT_FORMATS[extension]
+
+
+def open_segment_writer(path):
+    writer_class, _ = get_segment_format(path)
+    return writer_class(path)
+
+
+def export_segments(segments, path):
+    # Write segments one by one as they are produced, skipping labeless chunks
+    count = 0
+    with open_segment_writer(path) as writer:
+        for segment in segments:
+            if segment[0] != 0:
+                writer.write(segment)
+                count += 1
+    return count
+
+
+def iter_segments(path):
+    _, reader = get_segment_format(path)
+    return reader(path)
+
+
+def import_segments(path):
+    return list(iter_segments(path))
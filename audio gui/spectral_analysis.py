@@ -0,0 +1,43 @@
+import functools
+import librosa
+import numpy as np
+import scipy.fft
+import scipy.signal
+
+# Analysis parameters shared by the spectrogram view and the classifier (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+
+
+@functools.lru_cache(maxsize=None)
+def get_window(n_fft=N_FFT):
+    return scipy.signal.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def get_mel_filterbank(sr, n_fft=N_FFT, n_mels=N_MELS):
+    return librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def get_dct_matrix(n_mels=N_MELS, n_mfcc=N_MFCC):
+    # Orthonormal DCT-II, the same transform librosa.feature.mfcc applies
+    return scipy.fft.dct(np.eye(n_mels, dtype=np.float32), type=2, norm='ortho', axis=0)[:n_mfcc]
+
+
+def stft_magnitude(signal):
+    # Centered float32 STFT magnitude with the cached window
+    stft = librosa.stft(signal, n_fft=N_FFT, hop_length=HOP_LENGTH, window=get_window(N_FFT), dtype=np.complex64)
+    return np.abs(stft)
+
+
+def magnitude_to_db(magnitude):
+    return librosa.amplitude_to_db(magnitude, ref=np.max)
+
+
+def mfcc(signal, sr):
+    # Equivalent to librosa.feature.mfcc(y=signal, sr=sr, n_mfcc=N_MFCC) with cached filterbanks
+    mel = get_mel_filterbank(sr, N_FFT, N_MELS) @ (stft_magnitude(signal) ** 2)
+    return get_dct_matrix(N_MELS, N_MFCC) @ librosa.power_to_db(mel)
@@ -1,10 +1,13 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.colorbar as cbr
 import numpy as np
 import librosa
 
+import audio_decoding
+import spectral_analysis
+from render_scheduler import LayoutCanvas, RenderScheduler
+
 WAVEFORM_HEIGHT_PERCENTAGE = 0.42
 
 class SpectrogramWidget(QWidget):
@@ -15,6 +18,8 @@ class SpectrogramWidget(QWidget):
         self.audio_data = None
         self.sample_rate = None
 
+        self.ax = None
+
         self.initUI()
 
     def initUI(self):
@@ -22,9 +27,12 @@ class SpectrogramWidget(QWidget):
 
         # Create a Matplotlib figure and canvas
         self.figure = Figure(figsize=(self.width() / 100, self.height() / 100), dpi=100)  # Adjust the figsize to fit the widget size
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = LayoutCanvas(self.figure)
         layout.addWidget(self.canvas)
 
+        # Coalesces redraw requests into at most one draw per frame
+        self.render_scheduler = RenderScheduler(self.canvas, parent=self)
+
         # Set size policy to expand the widget's height based on WAVEFORM_HEIGHT_PERCENTAGE
         height = int(self.parent().height() * WAVEFORM_HEIGHT_PERCENTAGE * 2)
         self.setMinimumHeight(height)
@@ -34,32 +42,25 @@ class SpectrogramWidget(QWidget):
 
     def loadAudioData(self):
         try:
-            # Load the audio data using librosa
-            self.audio_data, self.sample_rate = librosa.load(self.file_name, sr=None, mono=True, dtype=float)
+            # Load the audio data, sharing the decode with the other widgets
+            self.audio_data, self.sample_rate = audio_decoding.load_audio(self.file_name)
             self.plotSpectrogram()
         except Exception as e:
             print(f"Error loading audio data: {str(e)}")
             self.audio_data = None
 
     def plotSpectrogram(self):
-        if self.audio_data is not None:
-            self.figure.clear()  # Clear the existing spectrogram
-
-            # Get the actual width and height of the widget
-            width = self.canvas.width()
-            height = self.canvas.height()
-
-            # Update the figsize of the figure to match the widget's dimensions
-            self.figure.set_size_inches(width, height)
-
-            # Compute the spectrogram using librosa
-            spectrogram = librosa.amplitude_to_db(np.abs(librosa.stft(self.audio_data)), ref=np.max)
+        # The axes are created once, the figure is never cleared and rebuilt
+        if self.audio_data is not None and self.ax is None:
+            # STFT of the whole file at its native sample rate, only the dB image is kept
+            spectrogram = spectral_analysis.magnitude_to_db(spectral_analysis.stft_magnitude(self.audio_data))
 
             # Create a grid of subplots with 2 rows and 1 column
             gs = self.figure.add_gridspec(2, 1, height_ratios=[0.1, 0.9])
 
             # Plot the spectrogram in the bottom subplot
             ax = self.figure.add_subplot(gs[1])
+            self.ax = ax
             ax.set_xlabel("")  # Remove x-axis label completely
             ax.set_ylabel("")  # Remove y-axis label completely
             ax.xaxis.tick_top()
@@ -75,7 +76,8 @@ class SpectrogramWidget(QWidget):
             ax.tick_params(axis='x', direction='in', pad=-15, width=2, color='white', labelcolor='white')
             ax.tick_params(axis='y', direction='in', pad=-30, width=2, color='white', labelcolor='white')
 
-            im = librosa.display.specshow(spectrogram, sr=self.sample_rate, x_axis='time', y_axis='log', ax=ax)
+            im = librosa.display.specshow(spectrogram, sr=self.sample_rate, hop_length=spectral_analysis.HOP_LENGTH,
+                                          x_axis='time', y_axis='log', ax=ax)
 
             # Create a new axis for the color bar in the top subplot
             cax = self.figure.add_subplot(gs[0])
@@ -92,6 +94,4 @@ class SpectrogramWidget(QWidget):
             cbar.ax.set_xticklabels(x_tick_labels)
             x_tick_labels[-1].set_color('black')  # Change color of the rightmost tick label
 
-            self.figure.tight_layout()
-            self.canvas.draw()
-    
\ No newline at end of file
+            self.render_scheduler.requestLayout()
\ No newline at end of file
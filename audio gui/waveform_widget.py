@@ -1,15 +1,17 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 import matplotlib.patheffects as path_effects
 from PyQt5.QtGui import QIcon
 import numpy as np
-import librosa
+import os
 import time as t
 from PyQt5.QtCore import pyqtSignal, QSize, Qt
 
+import audio_decoding
 import backend_methods
+import segment_export
+from render_scheduler import LayoutCanvas, RenderScheduler
 
 # Constants for the waveform visualization
 WAVEFORM_HEIGHT_PERCENTAGE = 0.35
@@ -25,7 +27,7 @@ class WaveformWidget(QWidget):
         self.file_name = file_name
         self.audio_data = None
         self.processed_data = None
-        self.called_tight_layout = False
+        self.ax = None
         self.sample_rate = None
 
         self.start_index = None
@@ -36,6 +38,12 @@ class WaveformWidget(QWidget):
         self.is_selecting = False
 
         self.texts = []
+        self.lines = []
+
+        self.label_tracks = {}
+        self.active_track = None
+        self.disagreements = []
+        self.disagreement_markers = None
 
         self.zoomed_in = False
         self.zoom_start_index = None
@@ -50,9 +58,12 @@ class WaveformWidget(QWidget):
 
         # Create a Matplotlib figure and canvas
         self.figure = Figure(figsize=(self.width() / 100, self.height() / 100), dpi=100)  # Adjust the figsize to fit the widget size
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = LayoutCanvas(self.figure)
         layout.addWidget(self.canvas)
 
+        # Coalesces redraw requests into at most one draw per frame
+        self.render_scheduler = RenderScheduler(self.canvas, parent=self)
+
         # Set size policy to expand the widget's height based on WAVEFORM_HEIGHT_PERCENTAGE
         height = int(self.parent().height() * WAVEFORM_HEIGHT_PERCENTAGE * 2)
         self.setMinimumHeight(height)
@@ -90,16 +101,8 @@ class WaveformWidget(QWidget):
         self.canvas.mpl_connect('button_release_event', self.mouseReleaseEvent)
 
     def plotWaveform(self):
-        if self.audio_data is not None:
-            self.figure.clear()  # Clear the existing plot
-
-            # Get the actual width and height of the widget
-            width = self.canvas.width()
-            height = self.canvas.height()
-
-            # Update the figsize of the figure to match the widget's dimensions
-            self.figure.set_size_inches(width, height)
-
+        # The axis is created once, later updates (labels, selection, zoom) change its artists in place
+        if self.audio_data is not None and self.ax is None:
             ax = self.figure.add_subplot(111)
             self.ax = ax
             time = np.arange(len(self.audio_data))  # Time points
@@ -121,32 +124,97 @@ class WaveformWidget(QWidget):
             self.selection_overlay = Rectangle((0, 0), 0, 0, color='gray', alpha=0.5)
             ax.add_patch(self.selection_overlay)
 
-            self.figure.tight_layout()  # Stretch the graph to fit the available space
-            self.canvas.draw()
+            self.render_scheduler.requestLayout()  # Stretch the graph to fit the available space
 
     def loadAudioData(self):
         try:
-            # Load the audio data using librosa
-            self.audio_data, self.sample_rate = librosa.load(self.file_name, sr=None, mono=True, dtype=float)
+            # Load the audio data, sharing the decode with the other widgets
+            self.audio_data, self.sample_rate = audio_decoding.load_audio(self.file_name)
             self.plotWaveform()
         except Exception as e:
             print(f"Error loading audio data: {str(e)}")
             self.audio_data = None
 
-    def runBackendProcessing(self):
-        self.processed_data = backend_methods.runBackendProcessing(self.file_name)
+    def runBackendProcessing(self, model_paths=None):
+        if model_paths is None:
+            model_paths = [backend_methods.DEFAULT_MODEL_PATH]
+
+        # Every model shares a single feature extraction pass
+        self.label_tracks, self.disagreements = backend_methods.runComparisonProcessing(self.file_name, model_paths)
 
+        for processed_data in self.label_tracks.values():
+            self.removeLabelessChunks(processed_data)
+
+        self.active_track = next(iter(self.label_tracks))
+        self.processed_data = self.label_tracks[self.active_track]
+        self.addLines()  # Update the waveform graph with the processed data
+        self.addDisagreementMarkers()
+
+    def removeLabelessChunks(self, processed_data):
         # Remove labeless chunks
         index = -1
-        for i in range(len(self.processed_data)):
-            if self.processed_data[i][0] == 0:
+        for i in range(len(processed_data)):
+            if processed_data[i][0] == 0:
                 index = i
 
         if index >= 0:
-            self.processed_data.pop(index)
+            processed_data.pop(index)
+
+    def exportProcessedData(self, path):
+        # Stream the active label track to a CSV, JSONL, Audacity or Parquet file
+        return segment_export.export_segments(self.processed_data, path)
+
+    def importProcessedData(self, path):
+        # Restore a saved label track without re-running the backend
+        processed_data = segment_export.import_segments(path)
+
+        self.clearLines()
+        self.active_track = os.path.splitext(os.path.basename(path))[0]
+        self.label_tracks = {self.active_track: processed_data}
+        self.disagreements = []
+        self.processed_data = self.label_tracks[self.active_track]
+        self.addLines()
+        self.addDisagreementMarkers()
+        self.render_scheduler.requestDraw()
+
+    def addDisagreementMarkers(self):
+        # Shade the segments where the compared models disagree, drawn as a single artist
+        if self.disagreement_markers is not None:
+            self.disagreement_markers.remove()
+            self.disagreement_markers = None
+
+        if self.disagreements:
+            spans = []
+            for start_time, end_time, _ in self.disagreements:
+                start_time_index = self.convertTimeToIndex(start_time)
+                spans.append((start_time_index, self.convertTimeToIndex(end_time) - start_time_index))
+
+            self.disagreement_markers = self.ax.broken_barh(spans, (-1, 2), color='orange', alpha=0.2)
+
+        self.render_scheduler.requestDraw()
+
+    def getDisagreements(self):
+        return self.disagreements
+
+    def getLabelTracks(self):
+        return list(self.label_tracks)
+
+    def setActiveTrack(self, name):
+        if name in self.label_tracks and name != self.active_track:
+            self.clearLines()
+            self.active_track = name
+            self.processed_data = self.label_tracks[name]
+            self.addLines()
+            self.render_scheduler.requestDraw()
+
+    def clearLines(self):
+        # Remove the lines and labels of the currently displayed track
+        for artist in self.lines + self.texts:
+            artist.remove()
+
+        self.lines = []
+        self.texts = []
 
-        self.addLines()  # Update the waveform graph with the processed data
-    
     def dummyBackEnd(self):
         # Placeholder for backend processing
         # Sleep for 2 seconds to simulate backend processing
@@ -177,7 +245,8 @@ class WaveformWidget(QWidget):
                 end_time_index = self.convertTimeToIndex(end_time)
 
                 # Draw the line between start_time and end_time
-                self.ax.plot([start_time_index, end_time_index], [0, 0], color='red', linewidth=2)
+                line, = self.ax.plot([start_time_index, end_time_index], [0, 0], color='red', linewidth=2)
+                self.lines.append(line)
 
                 # Add text label with classification at the midpoint of the line
                 text_x = (start_time_index + end_time_index) / 2
@@ -186,6 +255,8 @@ class WaveformWidget(QWidget):
 
                 self.texts.append(text)
 
+            self.render_scheduler.requestDraw()
+
     def changeText(self): 
         i = 0
         changed = False
@@ -203,7 +274,7 @@ class WaveformWidget(QWidget):
             
             if not found:
                 self.texts[i].set_text(self.processed_data[i][2])
-                self.canvas.draw()
+                self.render_scheduler.requestDraw()
                 changed = True
 
             i += 1
@@ -219,7 +290,7 @@ class WaveformWidget(QWidget):
 
             # Update the x-axis range of the waveform graph
             self.ax.set_xlim(new_xlim)
-            self.canvas.draw()
+            self.render_scheduler.requestDraw()
 
             # Update the spectrogram widget to match the zoomed-in waveform
             #self.parent().spectrogram_widget.updateSpectrogramRange(new_xlim)
@@ -232,7 +303,7 @@ class WaveformWidget(QWidget):
             # Reset the x-axis range of the waveform graph to cover the entire audio data
             full_xlim = (0, len(self.audio_data))
             self.ax.set_xlim(full_xlim)
-            self.canvas.draw()
+            self.render_scheduler.requestDraw()
 
             # Update the spectrogram widget to match the full waveform
             #self.parent().spectrogram_widget.updateSpectrogramRange(full_xlim)
@@ -300,11 +371,11 @@ class WaveformWidget(QWidget):
             self.selection_overlay.set_xy((x, y))
             self.selection_overlay.set_width(selection_width)
             self.selection_overlay.set_height(selection_height)
-            self.canvas.draw()
+            self.render_scheduler.requestDraw()
         else:
             self.selection_overlay.set_width(0)
             self.selection_overlay.set_height(0)
-            self.canvas.draw()
+            self.render_scheduler.requestDraw()
 
     def sample_to_timestamp(self, sample):
         # Convert the audio samples to the timestamp format "HR:MM:SS.SSS"
@@ -312,13 +383,18 @@ class WaveformWidget(QWidget):
             raise ValueError("Sample rate not available. Load audio data first using loadAudioData().") 
 
         time_in_seconds = sample / self.sample_rate
-        milliseconds = int((time_in_seconds % 1) * 1000)
-        time_obj = t.gmtime(time_in_seconds)
-        timestamp = t.strftime("%H:%M:%S.", time_obj) + f"{milliseconds:03d}"
+
+        # Hours are not wrapped at 24 so selections in files longer than a day map back correctly
+        hours, milliseconds = divmod(int(time_in_seconds * 1000), 3600000)
+        minutes, milliseconds = divmod(milliseconds, 60000)
+        seconds, milliseconds = divmod(milliseconds, 1000)
+        timestamp = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
         return timestamp
 
     def getProcessedData(self):
         return self.processed_data
     
     def setProceessedData(self, data):
-        self.processed_data = data
\ No newline at end of file
+        self.processed_data = data
+        if self.active_track is not None:
+            self.label_tracks[self.active_track] = data
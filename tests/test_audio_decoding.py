@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+librosa = pytest.importorskip("librosa")
+sf = pytest.importorskip("soundfile")
+
+import audio_decoding
+
+RATE = 44100
+
+
+def write_test_file(path, channels=2):
+    rng = np.random.default_rng(0)
+    time = np.arange(RATE * 3) / RATE
+    tone = 0.4 * np.sin(2 * np.pi * 440 * time)
+    data = np.stack([tone + 0.05 * rng.standard_normal(len(time)) for _ in range(channels)], axis=1)
+    sf.write(str(path), data, RATE)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def clear_decode_cache():
+    audio_decoding.clear_cache()
+    yield
+    audio_decoding.clear_cache()
+
+
+@pytest.mark.parametrize("extension", [".wav", ".flac", ".ogg"])
+def test_decode_matches_librosa_load(tmp_path, extension):
+    path = write_test_file(tmp_path / f"audio{extension}")
+
+    signal, rate = audio_decoding.decode_audio(path)
+    expected, expected_rate = librosa.load(path, sr=None, mono=True)
+
+    assert rate == expected_rate == RATE
+    assert signal.dtype == np.float32
+    np.testing.assert_array_equal(signal, expected)
+
+
+@pytest.mark.parametrize("extension", [".wav", ".flac", ".ogg"])
+def test_resampled_decode_matches_librosa_load(tmp_path, extension):
+    path = write_test_file(tmp_path / f"audio{extension}")
+
+    signal, rate = audio_decoding.decode_audio(path, 22050)
+    expected, expected_rate = librosa.load(path, sr=22050, mono=True)
+
+    assert rate == expected_rate == 22050
+    np.testing.assert_array_equal(signal, expected)
+
+
+def test_load_audio_decodes_again_when_file_changes(tmp_path):
+    path = write_test_file(tmp_path / "audio.wav")
+    first, _ = audio_decoding.load_audio(path)
+    assert audio_decoding.load_audio(path)[0] is first
+
+    sf.write(path, np.zeros(RATE, dtype=np.float32), RATE)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+    second, _ = audio_decoding.load_audio(path)
+    assert len(second) == RATE and not second.any()
@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+
+import backend_methods
+import segment_export
+
+
+class StubModel:
+    # Returns fixed class probabilities, one row per input row
+    def __init__(self, classes):
+        self.probabilities = np.eye(len(backend_methods.class_dict))[classes] * 0.9
+        self.offset = 0
+
+    def predict(self, features, batch_size=None, verbose=None):
+        rows = self.probabilities[self.offset:self.offset + len(features)]
+        self.offset += len(features)
+        return rows
+
+
+def stub_pipeline(monkeypatch, models, num_chunks=3, chunk_indices=(0, 1)):
+    features = np.zeros((len(chunk_indices), 13, 87, 1), dtype=np.float32)
+    monkeypatch.setattr(backend_methods, "load_models", lambda model_paths: models)
+    monkeypatch.setattr(backend_methods, "extract_features", lambda path, workers=None: (features, list(chunk_indices), num_chunks))
+
+
+def test_build_model_names_disambiguates_every_collision():
+    names = backend_methods.build_model_names(["a/m.keras", "b/m.keras", "c/other.keras"])
+    assert names == ["m (1)", "m (2)", "other"]
+
+
+def test_build_processed_data_places_rows_by_chunk():
+    probabilities = np.array([[0.1, 0.9] + [0] * 8, [0.7, 0.3] + [0] * 8])
+
+    processed_data = backend_methods.build_processed_data(probabilities, [0, 2], 3)
+
+    assert processed_data[0] == ["00:00:00.000", "00:00:05.000", "chainsaw", pytest.approx(0.9)]
+    assert processed_data[1] == [0, 0, 0, 0]
+    assert processed_data[2] == ["00:00:05.000", "00:00:10.000", "dog", pytest.approx(0.7)]
+
+
+def test_build_disagreement_report():
+    label_tracks = {
+        "a": [["00:00:00.000", "00:00:05.000", "dog", 0.9], ["00:00:05.000", "00:00:10.000", "rain", 0.8], [0, 0, 0, 0]],
+        "b": [["00:00:00.000", "00:00:05.000", "dog", 0.6], ["00:00:05.000", "00:00:10.000", "clock_tick", 0.5], [0, 0, 0, 0]],
+    }
+
+    report = backend_methods.build_disagreement_report(label_tracks)
+
+    assert report == [["00:00:05.000", "00:00:10.000", {"a": "rain", "b": "clock_tick"}]]
+
+
+def test_run_comparison_processing_shares_features(monkeypatch):
+    stub_pipeline(monkeypatch, {"a": StubModel([0, 4]), "b": StubModel([0, 1])})
+
+    label_tracks, report = backend_methods.runComparisonProcessing("file.wav", ["a.keras", "b.keras"])
+
+    assert [row[2] for row in label_tracks["a"]] == ["dog", "rain", 0]
+    assert [row[2] for row in label_tracks["b"]] == ["dog", "chainsaw", 0]
+    assert report == [["00:00:05.000", "00:00:10.000", {"a": "rain", "b": "chainsaw"}]]
+
+
+def test_export_writes_one_table_per_model(monkeypatch, tmp_path):
+    stub_pipeline(monkeypatch, {"m (1)": StubModel([0, 4]), "m (2)": StubModel([8, 8])})
+
+    counts = backend_methods.exportBackendProcessing("file.wav", str(tmp_path / "labels.csv"), ["a/m.keras", "b/m.keras"])
+
+    assert counts == {"m (1)": 2, "m (2)": 2}
+    assert [row[2] for row in segment_export.import_segments(str(tmp_path / "labels_m (1).csv"))] == ["dog", "rain"]
+    assert [row[2] for row in segment_export.import_segments(str(tmp_path / "labels_m (2).csv"))] == ["rooster", "rooster"]
+
+
+def test_export_single_model_uses_output_path(monkeypatch, tmp_path):
+    stub_pipeline(monkeypatch, {"model": StubModel([3, 3])})
+
+    output_path = str(tmp_path / "labels.jsonl")
+    assert backend_methods.exportBackendProcessing("file.wav", output_path, ["model.keras"]) == {"model": 2}
+    assert segment_export.import_segments(output_path)[1][:3] == ["00:00:05.000", "00:00:10.000", "helicopter"]
+
+
+def test_build_timestamp_does_not_wrap_after_24_hours():
+    assert backend_methods.build_timestamp("00:00:00.000") == "00:00:05.000"
+    assert backend_methods.build_timestamp("23:59:58.000") == "24:00:03.000"
+    assert backend_methods.build_timestamp("99:59:55.000") == "100:00:00.000"
@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+
+import feature_extraction
+
+RATE = 22050
+
+
+def test_parallel_matches_serial():
+    rng = np.random.default_rng(0)
+    signal = (0.3 * rng.standard_normal(RATE * 60)).astype(np.float32)
+    crop_starts = [i * RATE * 5 + int(rng.integers(0, RATE * 3)) for i in range(12)]
+
+    serial = feature_extraction.compute_mfccs(signal, RATE, crop_starts)
+    parallel = feature_extraction.extract_features_parallel(signal, RATE, crop_starts, workers=3)
+
+    assert parallel.shape == serial.shape == (12, 13, 87, 1)
+    np.testing.assert_array_equal(parallel, serial)
+
+
+def test_small_inputs_stay_serial(monkeypatch):
+    def fail(*args):
+        raise AssertionError("process pool used for a short file")
+
+    monkeypatch.setattr(feature_extraction, "extract_features_parallel", fail)
+    signal = np.zeros(RATE * 60, dtype=np.float32)
+
+    features = feature_extraction.compute_features(signal, RATE, [0, RATE * 5], workers=8)
+    assert features.shape == (2, 13, 87, 1)
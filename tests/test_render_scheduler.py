@@ -0,0 +1,89 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+np = pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+sf = pytest.importorskip("soundfile")
+pytest.importorskip("matplotlib")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from matplotlib.figure import Figure
+
+from render_scheduler import LayoutCanvas, RenderScheduler
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def process_events(qapp, seconds=0.15):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def canvas(qapp):
+    figure = Figure()
+    figure.add_subplot(111).plot([0, 1], [0, 1])
+    canvas = LayoutCanvas(figure)
+    canvas.resize(400, 300)
+    canvas.show()
+    process_events(qapp)
+    canvas.frame_times.clear()
+    yield canvas
+    canvas.close()
+
+
+def test_requests_within_a_frame_coalesce_into_one_draw(qapp, canvas):
+    scheduler = RenderScheduler(canvas)
+    rendered = []
+    canvas.frame_rendered.connect(rendered.append)
+
+    for _ in range(50):
+        scheduler.requestDraw()
+    process_events(qapp)
+
+    assert len(canvas.frame_times) == 1
+    assert rendered == [scheduler.frameTime()]
+    assert scheduler.averageFrameTime() == scheduler.frameTime()
+
+
+def test_resize_draws_once_with_the_new_layout(qapp, canvas, monkeypatch):
+    layouts = []
+    tight_layout = canvas.figure.tight_layout
+    monkeypatch.setattr(canvas.figure, "tight_layout", lambda: (layouts.append(canvas.width()), tight_layout()))
+
+    canvas.resize(800, 500)
+    process_events(qapp)
+
+    assert len(canvas.frame_times) == 1
+    assert layouts == [800]
+    assert not canvas.layout_dirty
+
+
+def test_widgets_create_their_axes_once(qapp, tmp_path):
+    import spectrogram_widget
+    import waveform_widget
+
+    path = str(tmp_path / "audio.wav")
+    sf.write(path, 0.3 * np.sin(np.linspace(0, 2000, 22050 * 3)), 22050)
+
+    parent = QtWidgets.QMainWindow()
+    parent.resize(800, 600)
+    for widget_class, plot in ((waveform_widget.WaveformWidget, "plotWaveform"),
+                               (spectrogram_widget.SpectrogramWidget, "plotSpectrogram")):
+        widget = widget_class(path, parent=parent)
+        widget.loadAudioData()
+        axes = list(widget.figure.axes)
+
+        getattr(widget, plot)()
+
+        assert widget.audio_data is not None
+        assert widget.figure.axes == axes
+    parent.close()
@@ -0,0 +1,65 @@
+import pytest
+
+import segment_export
+
+SEGMENTS = [
+    ["00:00:00.000", "00:00:05.000", "dog", 0.87],
+    ["00:00:05.000", "00:00:10.000", "rain"],  # Row without a probability column
+    [0, 0, 0, 0],  # Labeless chunk, never exported
+    ["23:59:55.000", "24:00:00.000", "sea_waves", 0.5],
+    ["24:00:00.000", "24:00:05.000", "crackling_fire", None],
+]
+
+EXPECTED = [
+    ["00:00:00.000", "00:00:05.000", "dog", 0.87],
+    ["00:00:05.000", "00:00:10.000", "rain", None],
+    ["23:59:55.000", "24:00:00.000", "sea_waves", 0.5],
+    ["24:00:00.000", "24:00:05.000", "crackling_fire", None],
+]
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_text_round_trip(tmp_path, extension):
+    path = str(tmp_path / f"labels{extension}")
+
+    assert segment_export.export_segments(iter(SEGMENTS), path) == 4
+    assert segment_export.import_segments(path) == EXPECTED
+
+
+def test_parquet_round_trip(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(segment_export, "PARQUET_ROW_GROUP_SIZE", 3)  # Spans several row groups
+    path = str(tmp_path / "labels.parquet")
+
+    assert segment_export.export_segments(iter(SEGMENTS), path) == 4
+    assert segment_export.import_segments(path) == EXPECTED
+
+
+def test_audacity_round_trip_drops_probabilities(tmp_path):
+    path = str(tmp_path / "labels.txt")
+
+    segment_export.export_segments(iter(SEGMENTS), path)
+
+    assert segment_export.import_segments(path) == [segment[:3] + [None] for segment in EXPECTED]
+    assert open(path).read().splitlines()[3] == "86400.000000\t86405.000000\tcrackling_fire"
+
+
+def test_audacity_import_skips_frequency_lines(tmp_path):
+    path = tmp_path / "labels.txt"
+    path.write_text("1.500000\t6.500000\tdog\n\\\t100.000000\t2000.000000\n90000.250000\t90005.250000\train\n")
+
+    assert segment_export.import_segments(str(path)) == [
+        ["00:00:01.500", "00:00:06.500", "dog", None],
+        ["25:00:00.250", "25:00:05.250", "rain", None],
+    ]
+
+
+def test_timestamps_do_not_wrap_after_24_hours():
+    assert segment_export.seconds_to_timestamp(86400.0) == "24:00:00.000"
+    assert segment_export.seconds_to_timestamp(3725.9996) == "01:02:06.000"
+    assert segment_export.timestamp_to_seconds("100:00:01.500") == 360001.5
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        segment_export.export_segments([], str(tmp_path / "labels.xlsx"))
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+librosa = pytest.importorskip("librosa")
+
+import spectral_analysis
+
+RATE = 22050
+
+# Same centered, zero padded STFT per crop as librosa; only float32 rounding differs (observed max ~4e-5)
+MFCC_RTOL = 1e-5
+MFCC_ATOL = 1e-3
+
+
+def make_crop(seed):
+    rng = np.random.default_rng(seed)
+    time = np.arange(2 * RATE) / RATE
+    tone = 0.5 * np.sin(2 * np.pi * 440 * time) + 0.2 * np.sin(2 * np.pi * 3000 * time)
+    return (tone + 0.05 * rng.standard_normal(len(time))).astype(np.float32)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_mfcc_matches_librosa(seed):
+    crop = make_crop(seed)
+
+    expected = librosa.feature.mfcc(y=crop, sr=RATE, n_mfcc=spectral_analysis.N_MFCC)
+    actual = spectral_analysis.mfcc(crop, RATE)
+
+    assert actual.shape == expected.shape == (13, 87)
+    np.testing.assert_allclose(actual, expected, rtol=MFCC_RTOL, atol=MFCC_ATOL)
+
+
+def test_mfcc_matches_librosa_on_silence():
+    crop = np.zeros(2 * RATE, dtype=np.float32)
+
+    expected = librosa.feature.mfcc(y=crop, sr=RATE, n_mfcc=spectral_analysis.N_MFCC)
+    np.testing.assert_allclose(spectral_analysis.mfcc(crop, RATE), expected, rtol=MFCC_RTOL, atol=MFCC_ATOL)
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio gui")
+
+# Stand-in keras package that records every process importing it
+STUB_KERAS = """
+import os
+with open(os.environ["KERAS_IMPORT_LOG"], "a") as log:
+    log.write(f"{os.getpid()}\\n")
+"""
+
+# Entry script importing the same backend chain main.py does, then running the feature pool
+ENTRY_SCRIPT = """
+import sys
+
+import numpy as np
+
+import backend_methods
+import feature_extraction
+
+if __name__ == "__main__":
+    signal = np.zeros(22050 * 30, dtype=np.float32)
+    features = feature_extraction.extract_features_parallel(signal, 22050, [0, 22050 * 10, 22050 * 20], 2)
+    print(features.shape, "keras" in sys.modules)
+"""
+
+
+def test_spawned_workers_do_not_import_keras(tmp_path):
+    stub_dir = tmp_path / "stubs" / "keras"
+    stub_dir.mkdir(parents=True)
+    (stub_dir / "__init__.py").write_text(STUB_KERAS)
+    script = tmp_path / "entry.py"
+    script.write_text(textwrap.dedent(ENTRY_SCRIPT))
+    log = tmp_path / "keras_imports.log"
+
+    env = dict(os.environ, KERAS_IMPORT_LOG=str(log),
+               PYTHONPATH=os.pathsep.join([str(tmp_path / "stubs"), APP_DIR]))
+    result = subprocess.run([sys.executable, str(script)], env=env, capture_output=True, text=True, timeout=300)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "(3, 13, 87, 1) False"
+    assert not log.exists(), f"keras imported by processes {log.read_text().split()}"